@@ -1,10 +1,14 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 import os
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
 import asyncio
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 import traceback
 from typing import Optional, Dict, Any
 import json
@@ -12,8 +16,28 @@ import aiohttp
 import google.generativeai as genai
 from datetime import datetime, timedelta
 
+from mcp_manager import SimpleMCPManager
+from smart_input_analyzer import SmartInputAnalyzer
+
 load_dotenv()
 
+# Buffered async logging: handlers enqueue records, a background thread writes
+# them out so request handlers never block on stdio
+_log_queue = queue.SimpleQueue()
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)])
+_log_listener = QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+
+logger = logging.getLogger(__name__)
+
+mcp_manager = SimpleMCPManager()
+input_analyzer = SmartInputAnalyzer()
+
+# Shared outbound session for SERP and Google APIs; created in lifespan so
+# keep-alive connections are reused across requests instead of paying a
+# TCP+TLS handshake per call
+http_session: Optional[aiohttp.ClientSession] = None
+
 
 # Request/Response models
 class FlightSearchRequest(BaseModel):
@@ -28,6 +52,9 @@ class FlightSearchResponse(BaseModel):
     data: Optional[Dict[Any, Any]] = None
     error: Optional[str] = None
     extracted_params: Optional[Dict[str, Any]] = None
+    needs_clarification: Optional[bool] = False
+    follow_up_question: Optional[str] = None
+    missing_info: Optional[list] = None
 
 
 class PlacesSearchRequest(BaseModel):
@@ -42,6 +69,8 @@ class PlacesSearchResponse(BaseModel):
     destination_city: Optional[str] = None
     natural_language_response: Optional[str] = None
     is_fallback: Optional[bool] = False
+    needs_clarification: Optional[bool] = False
+    follow_up_question: Optional[str] = None
 
 
 class CombinedTravelRequest(BaseModel):
@@ -55,7 +84,17 @@ class CombinedTravelResponse(BaseModel):
     success: bool
     data: dict = None
     error: str = None
+    flights: Optional[dict] = None
+    hotels: Optional[list] = None
     places: list = None
+    search_params: Optional[Dict[str, Any]] = None
+    needs_clarification: Optional[bool] = False
+    follow_up_question: Optional[str] = None
+    missing_info: Optional[list] = None
+
+
+class InputAnalysisRequest(BaseModel):
+    user_input: str
 
 
 class NaturalLanguageRequest(BaseModel):
@@ -84,98 +123,124 @@ class HotelSearchResponse(BaseModel):
     data: Optional[list] = None
     error: Optional[str] = None
     search_params: Optional[Dict[str, Any]] = None
+    needs_clarification: Optional[bool] = False
+    follow_up_question: Optional[str] = None
+    missing_info: Optional[list] = None
+
+
+# Clarification questions for missing travel parameters, built once at import
+_FIELD_QUESTIONS = {
+    'departure_id': "Which city or airport are you departing from?",
+    'arrival_id': "Which city or airport is your destination?",
+    'destination_city': "What city would you like to visit?",
+    'outbound_date': "When would you like to travel? Please provide a specific date.",
+    'return_date': "When would you like to return? (or say 'one-way' if not returning)",
+    'adults': "How many adults will be traveling?",
+    'children': "How many children will be traveling?"
+}
+
+_HOTEL_QUESTIONS = {
+    'destination_city': "Which city are you looking for hotels in?",
+    'outbound_date': "When do you need the hotel? Please provide your check-in date."
+}
+
+_HOTEL_COMBINED_QUESTIONS = {
+    frozenset({'destination_city', 'outbound_date'}):
+        "Which city are you looking for hotels in, and when do you need to check in?"
+}
 
 
 async def get_places_for_destination(destination_city: str, api_key: str) -> Optional[list]:
     """Get places for the destination city using Google Places API"""
 
     if not api_key:
-        print("⚠️ Google Places API key not provided")
+        logger.warning("⚠️ Google Places API key not provided")
         return None
     try:
-        async with aiohttp.ClientSession() as session:
-            # Step 1: Geocode the destination
-            print(f"🗺️ Geocoding destination: {destination_city}")
+        session = http_session
+        # Step 1: Geocode the destination
+        logger.info(f"🗺️ Geocoding destination: {destination_city}")
 
-            geocode_params = {
-                'address': destination_city,
-                'key': api_key
-            }
+        geocode_params = {
+            'address': destination_city,
+            'key': api_key
+        }
 
-            async with session.get(
-                    'https://maps.googleapis.com/maps/api/geocode/json',
-                    params=geocode_params,
-                    timeout=10
-            ) as response:
+        async with session.get(
+                'https://maps.googleapis.com/maps/api/geocode/json',
+                params=geocode_params,
+                timeout=10
+        ) as response:
 
-                if response.status != 200:
-                    print(f"❌ Geocoding failed: {response.status}")
-                    return None
+            if response.status != 200:
+                logger.error(f"❌ Geocoding failed: {response.status}")
+                return None
 
-                geocode_data = await response.json()
+            geocode_data = await response.json()
 
-                if geocode_data['status'] != 'OK':
-                    print(f"❌ Geocoding error: {geocode_data['status']}")
-                    return None
+            if geocode_data['status'] != 'OK':
+                logger.error(f"❌ Geocoding error: {geocode_data['status']}")
+                return None
 
-                location = geocode_data['results'][0]['geometry']['location']
-                print(f"✅ Found coordinates: {location['lat']}, {location['lng']}")
+            location = geocode_data['results'][0]['geometry']['location']
+            logger.info(f"✅ Found coordinates: {location['lat']}, {location['lng']}")
 
-            # Step 2: Search for tourist attractions
-            print("🏛️ Searching for attractions...")
+        # Step 2: Search for tourist attractions
+        logger.info("🏛️ Searching for attractions...")
 
-            places_params = {
-                'location': f"{location['lat']},{location['lng']}",
-                'radius': 10000,  # 10km radius
-                'type': 'tourist_attraction',
-                'key': api_key
-            }
+        places_params = {
+            'location': f"{location['lat']},{location['lng']}",
+            'radius': 10000,  # 10km radius
+            'type': 'tourist_attraction',
+            'key': api_key
+        }
 
-            async with session.get(
-                    'https://maps.googleapis.com/maps/api/place/nearbysearch/json',
-                    params=places_params,
-                    timeout=10
-            ) as response:
-
-                if response.status == 200:
-                    places_data = await response.json()
-                    places = places_data.get('results', [])
-                    print(f"✅ Found {len(places)} attractions in {destination_city}")
-
-                    if places:
-                        # Format places data for frontend
-                        formatted_places = []
-                        for place in places[:10]:  # Top 10 places
-                            formatted_place = {
-                                'name': place.get('name', 'Unknown'),
-                                'rating': place.get('rating', 0),
-                                'price_level': place.get('price_level', 0),
-                                'types': place.get('types', []),
-                                'vicinity': place.get('vicinity', ''),
-                                'place_id': place.get('place_id', ''),
-                                'photos': place.get('photos', [])
-                            }
-                            formatted_places.append(formatted_place)
-
-                        # Show top 3 attractions in logs
-                        print("📍 Top attractions:")
+        async with session.get(
+                'https://maps.googleapis.com/maps/api/place/nearbysearch/json',
+                params=places_params,
+                timeout=10
+        ) as response:
+
+            if response.status == 200:
+                places_data = await response.json()
+                places = places_data.get('results', [])
+                logger.info(f"✅ Found {len(places)} attractions in {destination_city}")
+
+                if places:
+                    # Format places data for frontend
+                    formatted_places = []
+                    for place in places[:10]:  # Top 10 places
+                        formatted_place = {
+                            'name': place.get('name', 'Unknown'),
+                            'rating': place.get('rating', 0),
+                            'price_level': place.get('price_level', 0),
+                            'types': place.get('types', []),
+                            'vicinity': place.get('vicinity', ''),
+                            'place_id': place.get('place_id', ''),
+                            'photos': place.get('photos', [])
+                        }
+                        formatted_places.append(formatted_place)
+
+                    # Show top 3 attractions in logs (debug only, free in production)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("📍 Top attractions:")
                         for i, place in enumerate(places[:3], 1):
                             name = place['name']
                             rating = place.get('rating', 'N/A')
                             price_level = place.get('price_level', 'N/A')
                             types = place.get('types', [])
 
-                            print(f"   {i}. {name}")
-                            print(f"      Rating: {rating}")
-                            print(f"      Price level: {price_level}")
-                            print(f"      Types: {', '.join(types[:2])}")
+                            logger.debug(f"   {i}. {name}")
+                            logger.debug(f"      Rating: {rating}")
+                            logger.debug(f"      Price level: {price_level}")
+                            logger.debug(f"      Types: {', '.join(types[:2])}")
 
-                        return formatted_places
-                else:
-                    print(f"❌ Places search failed: {response.status}")
-                    return None
+                    return formatted_places
+            else:
+                logger.error(f"❌ Places search failed: {response.status}")
+                return None
     except Exception as e:
-        print(f"❌ Error getting places for {destination_city}: {str(e)}")
+        logger.error(f"❌ Error getting places for {destination_city}: {str(e)}")
         return None
 
 
@@ -213,21 +278,21 @@ async def search_hotels_serp(destination_city: str, check_in_date: str = None, c
         serp_params['children'] = children
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                    'https://serpapi.com/search',
-                    params=serp_params,
-                    timeout=30
-            ) as response:
-                if response.status == 200:
-                    hotel_data = await response.json()
-                    return hotel_data
-                else:
-                    error_text = await response.text()
-                    raise HTTPException(
-                        status_code=response.status,
-                        detail=f"SERP Hotels API error: {error_text}"
-                    )
+        session = http_session
+        async with session.get(
+                'https://serpapi.com/search',
+                params=serp_params,
+                timeout=30
+        ) as response:
+            if response.status == 200:
+                hotel_data = await response.json()
+                return hotel_data
+            else:
+                error_text = await response.text()
+                raise HTTPException(
+                    status_code=response.status,
+                    detail=f"SERP Hotels API error: {error_text}"
+                )
 
     except asyncio.TimeoutError:
         raise HTTPException(status_code=504, detail="Hotel search timed out")
@@ -351,16 +416,8 @@ def validate_travel_params(params: Dict[str, Any], required_fields: list) -> tup
             missing_fields.append('outbound_date')
 
     if missing_fields:
-        # Generate contextual follow-up question
-        questions = {
-            'departure_id': "Which city or airport are you departing from?",
-            'arrival_id': "Which city or airport is your destination?",
-            'destination_city': "What city would you like to visit?",
-            'outbound_date': "When would you like to travel? Please provide a specific date.",
-            'return_date': "When would you like to return? (or say 'one-way' if not returning)",
-            'adults': "How many adults will be traveling?",
-            'children': "How many children will be traveling?"
-        }
+        # Generate contextual follow-up question from the precompiled table
+        questions = _FIELD_QUESTIONS
 
         if len(missing_fields) == 1:
             question = questions.get(missing_fields[0], f"Could you please specify {missing_fields[0]}?")
@@ -650,21 +707,21 @@ async def search_flights_serp(params: Dict[str, Any]) -> Dict[str, Any]:
         serp_params['children'] = params['children']
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                    'https://serpapi.com/search',
-                    params=serp_params,
-                    timeout=30
-            ) as response:
-                if response.status == 200:
-                    flight_data = await response.json()
-                    return flight_data
-                else:
-                    error_text = await response.text()
-                    raise HTTPException(
-                        status_code=response.status,
-                        detail=f"SERP API error: {error_text}"
-                    )
+        session = http_session
+        async with session.get(
+                'https://serpapi.com/search',
+                params=serp_params,
+                timeout=30
+        ) as response:
+            if response.status == 200:
+                flight_data = await response.json()
+                return flight_data
+            else:
+                error_text = await response.text()
+                raise HTTPException(
+                    status_code=response.status,
+                    detail=f"SERP API error: {error_text}"
+                )
 
     except asyncio.TimeoutError:
         raise HTTPException(status_code=504, detail="Flight search timed out")
@@ -683,18 +740,18 @@ def format_enhanced_flight_data(flight_data: Dict[str, Any], extracted_params: D
     # Format flights for easier frontend consumption
     formatted_flights = []
 
-    # Debug: Print first flight structure to understand SERP API response
-    if best_flights:
-        print("🔍 Debug: First flight structure from SERP API:")
+    # Debug: log first flight structure to understand SERP API response
+    if best_flights and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🔍 Debug: First flight structure from SERP API:")
         first_flight_debug = best_flights[0]
-        print(f"   Flight keys: {list(first_flight_debug.keys())}")
+        logger.debug(f"   Flight keys: {list(first_flight_debug.keys())}")
         if 'flights' in first_flight_debug and first_flight_debug['flights']:
             flight_segment = first_flight_debug['flights'][0]
-            print(f"   Flight segment keys: {list(flight_segment.keys())}")
+            logger.debug(f"   Flight segment keys: {list(flight_segment.keys())}")
             if 'departure_airport' in flight_segment:
-                print(f"   Departure airport: {flight_segment['departure_airport']}")
+                logger.debug(f"   Departure airport: {flight_segment['departure_airport']}")
             if 'arrival_airport' in flight_segment:
-                print(f"   Arrival airport: {flight_segment['arrival_airport']}")
+                logger.debug(f"   Arrival airport: {flight_segment['arrival_airport']}")
 
     for flight in best_flights + other_flights:
         formatted_flight = {
@@ -766,14 +823,23 @@ def format_enhanced_flight_data(flight_data: Dict[str, Any], extracted_params: D
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    print("🚀 Starting AI Travel Agent...")
-    print("✅ REST API ready!")
+    logger.info("🚀 Starting AI Travel Agent...")
+    global http_session
+    http_session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, keepalive_timeout=60)
+    )
+    await mcp_manager.initialize_servers()
+    logger.info("✅ REST API ready!")
     yield
     # Shutdown
-    print("🔄 Shutting down...")
+    logger.info("🔄 Shutting down...")
+    if http_session:
+        await http_session.close()
+    await mcp_manager.shutdown()
 
 
-app = FastAPI(title="AI Travel Agent API", lifespan=lifespan)
+app = FastAPI(title="AI Travel Agent API", lifespan=lifespan,
+              default_response_class=ORJSONResponse)
 
 # CORS for frontend
 app.add_middleware(
@@ -804,11 +870,11 @@ async def search_flights(request: FlightSearchRequest):
         # Step 1: Parse the natural language request
         # If locations are provided from globe, use them to enhance the parsing
         if request.locations and len(request.locations) >= 2:
-            print(f"🌍 Globe locations provided: {[loc['name'] for loc in request.locations]}")
-            print(f"🎯 Trip type specified: {request.trip_type}")
+            logger.info(f"🌍 Globe locations provided: {[loc['name'] for loc in request.locations]}")
+            logger.info(f"🎯 Trip type specified: {request.trip_type}")
             extracted_params = await parse_flight_request_with_locations(request.message, request.locations, request.trip_type)
         else:
-            print(f"🎯 Trip type specified: {request.trip_type}")
+            logger.info(f"🎯 Trip type specified: {request.trip_type}")
             extracted_params = await parse_flight_request(request.message, request.trip_type)
 
         # Step 2: Validate required parameters
@@ -816,7 +882,7 @@ async def search_flights(request: FlightSearchRequest):
         is_valid, missing_fields, follow_up_question = validate_travel_params(extracted_params, required_fields)
 
         if not is_valid:
-            print(f"❓ Missing flight info: {missing_fields}")
+            logger.info(f"❓ Missing flight info: {missing_fields}")
             return FlightSearchResponse(
                 success=True,  # Still successful, just needs clarification
                 needs_clarification=True,
@@ -893,7 +959,7 @@ async def search_places(request: PlacesSearchRequest):
                     is_fallback=True
                 )
             except Exception as fallback_error:
-                print(f"❌ Natural language fallback also failed: {str(fallback_error)}")
+                logger.error(f"❌ Natural language fallback also failed: {str(fallback_error)}")
                 return PlacesSearchResponse(
                     success=False,
                     error=f"Could not find places for {request.destination_city}"
@@ -957,7 +1023,7 @@ async def generate_natural_language_response(user_query: str, error_context: str
         return response.text.strip()
         
     except Exception as e:
-        print(f"❌ Error generating natural language response: {str(e)}")
+        logger.error(f"❌ Error generating natural language response: {str(e)}")
         return "I'm having trouble with my travel services right now, but I'd be happy to help you plan your trip once the connection is restored. Please try again in a few moments."
 
 
@@ -978,7 +1044,7 @@ async def combined_travel_search(request: CombinedTravelRequest):
     """
 
     try:
-        print(f"🌍 Combined travel search: {request.message}")
+        logger.info(f"🌍 Combined travel search: {request.message}")
 
         # Step 1: Parse the travel request to validate we have enough info
         extracted_params = await parse_enhanced_travel_request(request.message)
@@ -988,7 +1054,7 @@ async def combined_travel_search(request: CombinedTravelRequest):
         is_valid, missing_fields, follow_up_question = validate_travel_params(extracted_params, required_fields)
 
         if not is_valid:
-            print(f"❓ Missing travel info for combined search: {missing_fields}")
+            logger.info(f"❓ Missing travel info for combined search: {missing_fields}")
             return CombinedTravelResponse(
                 success=True,  # Still successful, just needs clarification
                 needs_clarification=True,
@@ -996,18 +1062,39 @@ async def combined_travel_search(request: CombinedTravelRequest):
                 missing_info=missing_fields
             )
 
-        # Step 3: Call individual endpoints concurrently
-        print("🔄 Calling flights, hotels, and places endpoints...")
+        # Step 3: Run the underlying searches directly with the params we
+        # already extracted. Nothing is launched until validation passed, so a
+        # clarification never wastes hotel/places calls, and we avoid three
+        # separate Gemini parses of the same message.
+        logger.info("🔄 Running flights, hotels, and places searches...")
+
+        check_in_date = extracted_params.get('outbound_date')
+        check_out_date = extracted_params.get('return_date')
 
-        # Create request objects for each endpoint
-        flight_request = FlightSearchRequest(message=request.message, user_id=request.user_id)
-        hotel_request = HotelSearchRequest(message=request.message, user_id=request.user_id)
-        places_request = PlacesSearchRequest(destination_city=extracted_params['destination_city'])
+        # If no return date (one-way trip), default to 2 nights
+        if not check_out_date and check_in_date:
+            check_out_date = (datetime.strptime(check_in_date, '%Y-%m-%d') + timedelta(days=2)).strftime('%Y-%m-%d')
 
-        # Call all three endpoints concurrently
-        flight_task = search_flights(flight_request)
-        hotel_task = search_hotels(hotel_request)
-        places_task = search_places(places_request)
+        hotel_search_params = {
+            'destination_city': extracted_params['destination_city'],
+            'check_in_date': check_in_date,
+            'check_out_date': check_out_date,
+            'adults': extracted_params.get('adults', 1),
+            'children': extracted_params.get('children', 0)
+        }
+
+        flight_task = search_flights_serp(extracted_params)
+        hotel_task = search_hotels_serp(
+            destination_city=extracted_params['destination_city'],
+            check_in_date=check_in_date,
+            check_out_date=check_out_date,
+            adults=extracted_params.get('adults', 1),
+            children=extracted_params.get('children', 0)
+        )
+        places_task = get_places_for_destination(
+            extracted_params['destination_city'],
+            os.getenv('GOOGLE_PLACES_API_KEY')
+        )
 
         # Wait for all results
         flight_result, hotel_result, places_result = await asyncio.gather(
@@ -1023,37 +1110,29 @@ async def combined_travel_search(request: CombinedTravelRequest):
         # Process flight results
         if isinstance(flight_result, Exception):
             errors.append(f"Flights: {str(flight_result)}")
-        elif flight_result.success and flight_result.data:
-            flights_data = flight_result.data
-        elif flight_result.needs_clarification:
-            # If flights need clarification, the combined search should too
-            return CombinedTravelResponse(
-                success=True,
-                needs_clarification=True,
-                follow_up_question=flight_result.follow_up_question,
-                missing_info=flight_result.missing_info
-            )
+        else:
+            flights_data = format_enhanced_flight_data(flight_result, extracted_params)
 
         # Process hotel results
         if isinstance(hotel_result, Exception):
             errors.append(f"Hotels: {str(hotel_result)}")
-        elif hotel_result.success and hotel_result.data:
-            hotels_data = hotel_result.data
+        else:
+            hotels_data = format_hotel_data(hotel_result, hotel_search_params)
 
         # Process places results
         if isinstance(places_result, Exception):
             errors.append(f"Places: {str(places_result)}")
-        elif places_result.success and places_result.data:
-            places_data = places_result.data
+        elif places_result:
+            places_data = places_result
 
         # Step 5: Log results
-        print(f"✅ Combined search results:")
-        print(f"   🛫 Flights: {len(flights_data.get('flights', [])) if flights_data else 0} found")
-        print(f"   🏨 Hotels: {len(hotels_data) if hotels_data else 0} found")
-        print(f"   📍 Places: {len(places_data) if places_data else 0} found")
+        logger.info(f"✅ Combined search results:")
+        logger.info(f"   🛫 Flights: {len(flights_data.get('flights', [])) if flights_data else 0} found")
+        logger.info(f"   🏨 Hotels: {len(hotels_data) if hotels_data else 0} found")
+        logger.info(f"   📍 Places: {len(places_data) if places_data else 0} found")
 
         if errors:
-            print(f"⚠️ Some errors occurred: {'; '.join(errors)}")
+            logger.warning(f"⚠️ Some errors occurred: {'; '.join(errors)}")
 
         # Step 6: Return combined results
         return CombinedTravelResponse(
@@ -1081,17 +1160,6 @@ async def combined_travel_search(request: CombinedTravelRequest):
             error=f"Unexpected error: {str(e)}"
         )
 
-    except HTTPException as e:
-        return CombinedTravelResponse(
-            success=False,
-            error=e.detail
-        )
-    except Exception as e:
-        return CombinedTravelResponse(
-            success=False,
-            error=f"Unexpected error: {str(e)}"
-        )
-
 
 @app.post("/api/hotels/search", response_model=HotelSearchResponse)
 async def search_hotels(request: HotelSearchRequest):
@@ -1112,7 +1180,7 @@ async def search_hotels(request: HotelSearchRequest):
 
     try:
         # Step 1: Parse the travel request to extract destination and dates
-        print(f"🏨 Parsing travel request for hotels: {request.message}")
+        logger.info(f"🏨 Parsing travel request for hotels: {request.message}")
         extracted_params = await parse_enhanced_travel_request(request.message)
 
         # Step 2: Validate required information for hotels
@@ -1126,15 +1194,8 @@ async def search_hotels(request: HotelSearchRequest):
             missing_info.append('outbound_date')
 
         if missing_info:
-            questions = {
-                'destination_city': "Which city are you looking for hotels in?",
-                'outbound_date': "When do you need the hotel? Please provide your check-in date."
-            }
-
-            if len(missing_info) == 1:
-                question = questions.get(missing_info[0])
-            else:
-                question = "Which city are you looking for hotels in, and when do you need to check in?"
+            question = (_HOTEL_COMBINED_QUESTIONS.get(frozenset(missing_info))
+                        or _HOTEL_QUESTIONS.get(missing_info[0]))
 
             return HotelSearchResponse(
                 success=True,
@@ -1155,9 +1216,9 @@ async def search_hotels(request: HotelSearchRequest):
         adults = request.adults if request.adults is not None else extracted_params.get('adults', 1)
         children = request.children if request.children is not None else extracted_params.get('children', 0)
 
-        print(f"🏨 Searching hotels in: {destination_city}")
-        print(f"📅 Check-in: {check_in_date}, Check-out: {check_out_date}")
-        print(f"👥 Adults: {adults}, Children: {children}")
+        logger.info(f"🏨 Searching hotels in: {destination_city}")
+        logger.info(f"📅 Check-in: {check_in_date}, Check-out: {check_out_date}")
+        logger.info(f"👥 Adults: {adults}, Children: {children}")
 
         # Step 4: Search hotels using SERP API
         hotel_data = await search_hotels_serp(
@@ -1177,30 +1238,30 @@ async def search_hotels(request: HotelSearchRequest):
             'children': children
         })
 
-        print(f"✅ Found {len(formatted_hotels)} hotels in {destination_city}")
+        logger.info(f"✅ Found {len(formatted_hotels)} hotels in {destination_city}")
 
-        # Log top 3 hotels
-        if formatted_hotels:
-            print("🏨 Top hotels:")
+        # Log top 3 hotels (debug only, free in production)
+        if formatted_hotels and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🏨 Top hotels:")
             for i, hotel in enumerate(formatted_hotels[:3], 1):
                 name = hotel['name']
                 rating = hotel.get('rating', 'N/A')
                 rate = hotel.get('rate_per_night', {}).get('lowest', 'N/A') if hotel.get('rate_per_night') else 'N/A'
                 booking_options = hotel.get('booking_options', [])
 
-                print(f"   {i}. {name}")
-                print(f"      Rating: {rating}")
-                print(f"      Rate per night: ${rate}" if rate != 'N/A' else f"      Rate per night: {rate}")
+                logger.debug(f"   {i}. {name}")
+                logger.debug(f"      Rating: {rating}")
+                logger.debug(f"      Rate per night: ${rate}" if rate != 'N/A' else f"      Rate per night: {rate}")
 
                 # Add booking links to console output
                 if booking_options:
-                    print(f"      Booking options: {len(booking_options)} available")
+                    logger.debug(f"      Booking options: {len(booking_options)} available")
                     for j, option in enumerate(booking_options[:2], 1):  # Show first 2 booking options
                         source = option.get('source', 'Unknown')
                         link = option.get('link', 'N/A')
-                        print(f"        {j}. {source}: {link}")
+                        logger.debug(f"        {j}. {source}: {link}")
                 else:
-                    print(f"      Booking options: None available")
+                    logger.debug(f"      Booking options: None available")
 
         return HotelSearchResponse(
             success=True,
@@ -1233,6 +1294,13 @@ async def search_hotels(request: HotelSearchRequest):
         )
 
 
+@app.post("/api/analyze")
+async def analyze_travel_input(request: InputAnalysisRequest):
+    """Fast pattern-based analysis of a free-form travel request"""
+    analysis = await input_analyzer.analyze_input(request.user_input)
+    return analysis
+
+
 @app.post("/api/chat/natural", response_model=NaturalLanguageResponse)
 async def natural_language_chat(request: NaturalLanguageRequest):
     """
@@ -1262,6 +1330,19 @@ async def natural_language_chat(request: NaturalLanguageRequest):
         )
 
 
+@app.middleware("http")
+async def track_performance(request, call_next):
+    start = mcp_manager.monitor.start_request()
+    response = await call_next(request)
+    mcp_manager.monitor.end_request(start, request.url.path, response.status_code < 500)
+    return response
+
+
+@app.get("/api/metrics")
+async def performance_metrics():
+    return mcp_manager.monitor.get_performance_report()
+
+
 @app.get("/api/health")
 async def health_check():
     return {
@@ -1270,6 +1351,7 @@ async def health_check():
         "flight_search": "available" if os.getenv('GEMINI_API_KEY') and os.getenv('SERP_API_KEY') else "needs_api_keys",
         "hotel_search": "available" if os.getenv('SERP_API_KEY') else "needs_serp_api_key",
         "google_places": "available" if os.getenv('GOOGLE_PLACES_API_KEY') else "needs_api_key",
+        "mcp_servers": mcp_manager.get_server_status(),
         "enhanced_travel": "available" if all([
             os.getenv('GEMINI_API_KEY'),
             os.getenv('SERP_API_KEY'),
@@ -1289,9 +1371,9 @@ if __name__ == "__main__":
 
     port = int(os.environ.get("PORT", 8000))
 
-    print("🚀 Starting FastAPI server...")
-    print("📍 Server will be available at: http://localhost:8000")
-    print("📖 API docs will be available at: http://localhost:8000/docs")
-    print("🔧 Health check: http://localhost:8000/api/health")
+    logger.info("🚀 Starting FastAPI server...")
+    logger.info("📍 Server will be available at: http://localhost:8000")
+    logger.info("📖 API docs will be available at: http://localhost:8000/docs")
+    logger.info("🔧 Health check: http://localhost:8000/api/health")
 
     uvicorn.run("main:app", host="0.0.0.0", port=port, reload=False)
\ No newline at end of file
@@ -0,0 +1,571 @@
+import asyncio
+import heapq
+import logging
+import time
+import aiohttp
+import orjson
+from array import array
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Counter slots in PerformanceMonitor._c: a flat C double array keeps each
+# record_* to one or two indexed stores instead of attribute lookups, and
+# stays consistent if a background thread ever reads it
+_REQUESTS = 0
+_RESPONSE_TIME = 1
+_CACHE_HITS = 2
+_CACHE_MISSES = 3
+_ERRORS = 4
+_GEMINI_CALLS = 5
+_GEMINI_TIME = 6
+_API_CALLS = 7
+_API_TIME = 8
+
+
+class PerformanceMonitor:
+    """Tracks request timing, cache effectiveness, and upstream call costs"""
+
+    def __init__(self):
+        self._c = array('d', [0.0] * 9)
+        # Events land in a plain deque (one C-level append per record) and a
+        # background flusher aggregates them into _c off the request path
+        self._pending = deque()
+        self._flush_task: Optional[asyncio.Task] = None
+        # maxlen deque: O(1) append with automatic eviction, no reslicing
+        self.request_history = deque(maxlen=100)
+        # Report memoization: dashboards poll every few seconds, so only
+        # recompute when a counter has actually moved
+        self._report_dirty = True
+        self._cached_report: Optional[Dict[str, Any]] = None
+
+    def start_request(self) -> float:
+        return time.perf_counter()
+
+    def end_request(self, start_time: float, request_type: str = 'request', success: bool = True) -> float:
+        duration = time.perf_counter() - start_time
+        self._pending.append(('req', duration, success))
+        # Store a raw float; most history entries age out of the deque
+        # without ever being shown, so isoformat only happens at report time
+        self.request_history.append({
+            'ts': time.time(),
+            'type': request_type,
+            'duration': duration,
+            'success': success
+        })
+        return duration
+
+    def record_cache_hit(self):
+        self._pending.append(('hit',))
+
+    def record_cache_miss(self):
+        self._pending.append(('miss',))
+
+    def record_gemini_call(self, duration: float):
+        self._pending.append(('gemini', duration))
+
+    def record_api_call(self, duration: float):
+        self._pending.append(('api', duration))
+
+    def _drain_pending(self):
+        pending = self._pending
+        if not pending:
+            return
+        c = self._c
+        while pending:
+            event = pending.popleft()
+            kind = event[0]
+            if kind == 'req':
+                c[_REQUESTS] += 1
+                c[_RESPONSE_TIME] += event[1]
+                if not event[2]:
+                    c[_ERRORS] += 1
+            elif kind == 'hit':
+                c[_CACHE_HITS] += 1
+            elif kind == 'miss':
+                c[_CACHE_MISSES] += 1
+            elif kind == 'gemini':
+                c[_GEMINI_CALLS] += 1
+                c[_GEMINI_TIME] += event[1]
+            else:
+                c[_API_CALLS] += 1
+                c[_API_TIME] += event[1]
+        self._report_dirty = True
+
+    async def _flusher(self):
+        while True:
+            await asyncio.sleep(0.1)
+            self._drain_pending()
+
+    def start_flusher(self):
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flusher())
+
+    def stop_flusher(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        self._drain_pending()
+
+    def get_performance_report(self) -> Dict[str, Any]:
+        # Catch up on anything the flusher has not aggregated yet so the
+        # report never lags by the flush interval
+        self._drain_pending()
+        if not self._report_dirty and self._cached_report is not None:
+            return dict(self._cached_report)
+        c = self._c
+        requests = int(c[_REQUESTS])
+        cache_total = c[_CACHE_HITS] + c[_CACHE_MISSES]
+        gemini_calls = int(c[_GEMINI_CALLS])
+        api_calls = int(c[_API_CALLS])
+        report = {
+            'total_requests': requests,
+            'avg_response_time': round(c[_RESPONSE_TIME] / requests, 3) if requests else 0.0,
+            'cache_hit_rate': round(c[_CACHE_HITS] / cache_total, 3) if cache_total else 0.0,
+            'error_rate': round(c[_ERRORS] / requests, 3) if requests else 0.0,
+            'gemini_calls': gemini_calls,
+            'avg_gemini_time': round(c[_GEMINI_TIME] / gemini_calls, 3) if gemini_calls else 0.0,
+            'api_calls': api_calls,
+            'avg_api_time': round(c[_API_TIME] / api_calls, 3) if api_calls else 0.0,
+            'recent_requests': [
+                {'timestamp': datetime.fromtimestamp(r['ts']).isoformat(),
+                 'type': r['type'], 'duration': r['duration'], 'success': r['success']}
+                for r in list(self.request_history)[-10:]
+            ]
+        }
+        self._cached_report = report
+        self._report_dirty = False
+        return dict(report)
+
+
+class _Entry:
+    """Slotted cache entry - about half the footprint of a two-key dict"""
+    __slots__ = ('data', 'timestamp', 'ref')
+
+    def __init__(self, data, timestamp):
+        self.data = data
+        self.timestamp = timestamp
+        # CLOCK reference bit: set on hit, cleared when the eviction scan
+        # gives the entry its second chance
+        self.ref = False
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts/lists/sets into hashable tuples"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set):
+        return tuple(sorted(_freeze(v) for v in value))
+    return value
+
+
+class SmartCache:
+    """TTL cache for tool responses so repeated identical calls skip the round-trip"""
+
+    def __init__(self, max_size: int = 1000, ttl_seconds: int = 300,
+                 monitor: Optional[PerformanceMonitor] = None):
+        # OrderedDict gives O(1) LRU: move_to_end on hit, popitem(last=False)
+        # to evict the oldest
+        self.cache: "OrderedDict[Any, _Entry]" = OrderedDict()
+        self.monitor = monitor
+        # Min-heap of (expiry_time, key) so clear_expired only touches entries
+        # whose TTL has actually elapsed; stale heap entries from re-sets are
+        # lazily discarded
+        self._expiry_heap: list = []
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+    def _generate_key(self, request_type: str, params: Dict[str, Any]) -> Any:
+        # Hashable tuple key -- no JSON round-trip or string allocation,
+        # the hashing happens at C level
+        try:
+            key = (request_type, _freeze(params))
+            hash(key)
+            return key
+        except TypeError:
+            # Params containing something _freeze can't make hashable fall
+            # back to a deterministic orjson byte string (C encoder, sorted
+            # keys, no str conversion needed)
+            return (request_type, orjson.dumps(params, option=orjson.OPT_SORT_KEYS))
+
+    def get(self, request_type: str, params: Dict[str, Any]) -> Optional[Any]:
+        key = self._generate_key(request_type, params)
+        # Single dict lookup on the hit path instead of `in` + subscript
+        try:
+            entry = self.cache[key]
+        except KeyError:
+            if self.monitor:
+                self.monitor.record_cache_miss()
+            return None
+        if time.monotonic() - entry.timestamp < self.ttl_seconds:
+            # CLOCK: flag the hit instead of relinking the entry; the
+            # eviction scan below honors the bit with a second chance
+            entry.ref = True
+            if self.monitor:
+                self.monitor.record_cache_hit()
+            return entry.data
+        del self.cache[key]
+        if self.monitor:
+            self.monitor.record_cache_miss()
+        return None
+
+    def set(self, request_type: str, params: Dict[str, Any], data: Any):
+        key = self._generate_key(request_type, params)
+        # Drain expired heap entries on every write so the heap (and the
+        # keys it pins) stays bounded by the live working set
+        self.clear_expired()
+        if key not in self.cache and len(self.cache) >= self.max_size:
+            self._evict_one()
+        now = time.monotonic()
+        self.cache[key] = _Entry(data, now)
+        self.cache.move_to_end(key)
+        heapq.heappush(self._expiry_heap, (now + self.ttl_seconds, key))
+
+    def _evict_one(self):
+        # Second-chance (CLOCK) eviction: entries hit since the last scan
+        # get their bit cleared and cycle to the back; the first unflagged
+        # entry is evicted. Terminates because each pass clears a bit.
+        cache = self.cache
+        while cache:
+            key, entry = next(iter(cache.items()))
+            if entry.ref:
+                entry.ref = False
+                cache.move_to_end(key)
+            else:
+                del cache[key]
+                return
+
+    def clear_expired(self):
+        now = time.monotonic()
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, key = heapq.heappop(heap)
+            entry = self.cache.get(key)
+            # Only drop the entry if it has not been refreshed since this
+            # heap record was pushed
+            if entry is not None and now - entry.timestamp >= self.ttl_seconds:
+                del self.cache[key]
+
+
+# Static skeletons for fallback payloads. Only the dynamic fields
+# (names, locations) are spliced in per call, so a fallback hit
+# allocates a handful of dicts instead of rebuilding every literal.
+_FALLBACK_RESTAURANTS = (
+    {'rating': 4.5, 'price_level': 2, 'description': 'A well-reviewed local favorite'},
+    {'rating': 4.2, 'price_level': 3, 'description': 'Authentic dishes in a cozy setting'},
+)
+_FALLBACK_FLIGHTS = (
+    {'airline': 'Major Airline', 'price': 450, 'currency': 'USD', 'duration': '8h 30m', 'stops': 0},
+    {'airline': 'Budget Carrier', 'price': 320, 'currency': 'USD', 'duration': '12h 15m', 'stops': 1},
+)
+_FALLBACK_HOTELS = (
+    {'rating': 4.3, 'price_per_night': 150, 'currency': 'USD', 'amenities': ['wifi', 'breakfast', 'gym']},
+    {'rating': 3.9, 'price_per_night': 80, 'currency': 'USD', 'amenities': ['wifi']},
+)
+_FALLBACK_ACTIVITIES = (
+    {'rating': 4.6, 'price': 25, 'currency': 'USD', 'duration': '3 hours'},
+    {'rating': 4.4, 'price': 40, 'currency': 'USD', 'duration': 'full day'},
+)
+_FALLBACK_ITINERARY_CLUSTERS = (
+    {'day': 1, 'theme': 'Arrival and city center'},
+    {'day': 2, 'theme': 'Top attractions'},
+    {'day': 3, 'theme': 'Local experiences'},
+)
+
+
+def _fallback_location(parameters: Dict[str, Any]) -> str:
+    return parameters.get('location', parameters.get('destination', 'your destination'))
+
+
+def _build_fallback_restaurants(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    location = _fallback_location(parameters)
+    cuisine = parameters.get('cuisine', 'local').title()
+    return {
+        'restaurants': [
+            {**_FALLBACK_RESTAURANTS[0],
+             'name': f"Popular {cuisine} Restaurant",
+             'cuisine': cuisine, 'location': location},
+            {**_FALLBACK_RESTAURANTS[1],
+             'name': f"Traditional {cuisine} Kitchen",
+             'cuisine': cuisine, 'location': location}
+        ],
+        'source': 'fallback_data'
+    }
+
+
+def _build_fallback_flights(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    location = _fallback_location(parameters)
+    origin = parameters.get('origin', 'your city')
+    return {
+        'flights': [
+            {**template, 'departure': origin, 'arrival': location}
+            for template in _FALLBACK_FLIGHTS
+        ],
+        'source': 'fallback_data'
+    }
+
+
+def _build_fallback_hotels(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    location = _fallback_location(parameters)
+    return {
+        'hotels': [
+            {**_FALLBACK_HOTELS[0],
+             'name': f"Central {location} Hotel", 'location': location},
+            {**_FALLBACK_HOTELS[1],
+             'name': f"{location} Budget Inn", 'location': location}
+        ],
+        'source': 'fallback_data'
+    }
+
+
+def _build_fallback_activities(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    location = _fallback_location(parameters)
+    return {
+        'activities': [
+            {**_FALLBACK_ACTIVITIES[0],
+             'name': f"{location} City Walking Tour", 'location': location},
+            {**_FALLBACK_ACTIVITIES[1],
+             'name': f"{location} Museum Pass", 'location': location}
+        ],
+        'source': 'fallback_data'
+    }
+
+
+def _build_fallback_itinerary(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'itinerary': {
+            'destination': _fallback_location(parameters),
+            'clusters': [
+                {**cluster, 'items': []}
+                for cluster in _FALLBACK_ITINERARY_CLUSTERS
+            ]
+        },
+        'source': 'fallback_data'
+    }
+
+
+# Read-only tools whose responses are safe to serve from SmartCache;
+# anything else (booking-style tools) always hits the server
+_CACHEABLE_TOOLS = frozenset({
+    'search_restaurants', 'search_flights', 'search_hotels',
+    'search_activities', 'create_itinerary',
+})
+
+_FALLBACK_BUILDERS = {
+    'search_restaurants': _build_fallback_restaurants,
+    'search_flights': _build_fallback_flights,
+    'search_hotels': _build_fallback_hotels,
+    'search_activities': _build_fallback_activities,
+    'create_itinerary': _build_fallback_itinerary,
+}
+
+
+@dataclass(slots=True)
+class _ServerRec:
+    """Fixed-shape server record: slot access beats two dict probes per call"""
+    port: int
+    url: str
+    status: str = 'unknown'
+    error: Optional[str] = None
+
+
+class SimpleMCPManager:
+    """Simple MCP Manager - calls the Node MCP servers over HTTP with fallback data"""
+
+    def __init__(self):
+        self.servers = {
+            name: _ServerRec(port=port, url=f'http://localhost:{port}')
+            for name, port in (
+                ('flight-server', 3001),
+                ('hotel-server', 3002),
+                ('activity-server', 3003),
+                ('restaurant-server', 3004),
+                ('clustering-server', 3005),
+                ('search-server', 3006),
+                ('fallback-server', 3007),
+            )
+        }
+        # Cap concurrent in-flight calls per server so bursts don't overwhelm
+        # the Node event loop or open unbounded sockets
+        self._server_semaphores = {name: asyncio.Semaphore(8) for name in self.servers}
+        # One session for all calls; created in initialize_servers so keep-alive
+        # amortizes connection setup across servers
+        self._session: Optional[aiohttp.ClientSession] = None
+        # ClientTimeout is immutable; build the two flavors once instead of
+        # per request
+        self._health_timeout = aiohttp.ClientTimeout(total=2)
+        self._call_timeout = aiohttp.ClientTimeout(total=30)
+        self.monitor = PerformanceMonitor()
+        self.cache = SmartCache(monitor=self.monitor)
+
+    async def initialize_servers(self):
+        logger.info("🔧 Checking for available MCP servers...")
+
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, limit_per_host=8, keepalive_timeout=60)
+        )
+
+        self.monitor.start_flusher()
+
+        # Probe all servers at once so wall time is max(rtt), not sum(rtt).
+        # Slow starters get retried with exponential backoff instead of being
+        # written off on the first probe.
+        pending = list(self.servers)
+        retry_delay = 1.0
+        for attempt in range(3):
+            results = await asyncio.gather(
+                *[self._check_server_health(name) for name in pending],
+                return_exceptions=True
+            )
+
+            still_down = []
+            for name, healthy in zip(pending, results):
+                if healthy is True:
+                    self.servers[name].status = 'ready'
+                    logger.info("✅ %s is available", name)
+                else:
+                    still_down.append(name)
+
+            pending = still_down
+            if not pending or attempt == 2:
+                break
+            logger.info("⏳ Retrying %d server(s) in %.1fs...", len(pending), retry_delay)
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 1.5, 5.0)
+
+        for name in pending:
+            self.servers[name].status = 'unavailable'
+            logger.error("❌ %s not available", name)
+
+        critical_servers = ['flight-server', 'hotel-server', 'activity-server', 'restaurant-server']
+        missing_critical = [name for name in critical_servers if self.servers[name].status != 'ready']
+
+        if missing_critical:
+            logger.warning("⚠️  Critical servers missing: %s", ', '.join(missing_critical))
+            logger.warning("⚠️  Fallback data will be used for these services")
+
+        ready_count = len([s for s in self.servers.values() if s.status == 'ready'])
+        logger.info("🎉 %d/%d MCP servers are operational!", ready_count, len(self.servers))
+
+    async def _check_server_health(self, name: str) -> bool:
+        server = self.servers.get(name)
+        if not server:
+            return False
+
+        try:
+            # HEAD skips the response body — all a liveness probe needs.
+            # Express servers that only route GET /health answer 405/404,
+            # so fall back to GET once in that case.
+            async with self._session.head(
+                    f"{server.url}/health",
+                    allow_redirects=False,
+                    timeout=self._health_timeout
+            ) as response:
+                if response.status == 200:
+                    return True
+                if response.status not in (404, 405):
+                    return False
+            async with self._session.get(
+                    f"{server.url}/health",
+                    timeout=self._health_timeout
+            ) as response:
+                return response.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Narrow catch so CancelledError (and interpreter shutdown)
+            # propagate instead of reading as "server down"
+            logger.debug("health probe %s failed: %s", name, e)
+            return False
+
+    async def call_server(self, server_name: str, tool_name: str, parameters: Dict[str, Any],
+                          cacheable: Optional[bool] = None) -> Dict[str, Any]:
+        server = self.servers.get(server_name)
+        if not server:
+            raise Exception(f"Server {server_name} not configured")
+
+        if cacheable is None:
+            cacheable = tool_name in _CACHEABLE_TOOLS
+        if cacheable:
+            cached = self.cache.get(f"{server_name}.{tool_name}", parameters)
+            if cached is not None:
+                return cached
+
+        if server.status != 'ready':
+            if await self._check_server_health(server_name):
+                server.status = 'ready'
+                logger.info("✅ %s is now available", server_name)
+            else:
+                # Server down is the expected degraded mode, not an error —
+                # hand back fallback data without paying for a raise/unwind
+                logger.debug("%s not ready (status: %s), using fallback",
+                             server_name, server.status)
+                return self._get_fallback_data(tool_name, parameters)
+
+        try:
+            # orjson encode/decode is ~3x stdlib json on the verbose
+            # listing payloads these servers return
+            payload = orjson.dumps({'tool': tool_name, 'parameters': parameters})
+            api_start = time.perf_counter()
+
+            async with self._server_semaphores[server_name]:
+                async with self._session.post(
+                        f"{server.url}/call-tool",
+                        data=payload,
+                        headers={'Content-Type': 'application/json'},
+                        timeout=self._call_timeout
+                ) as response:
+                    if response.status == 200:
+                        raw = await response.read()
+                        result = orjson.loads(raw)
+                        self.monitor.record_api_call(time.perf_counter() - api_start)
+                        logger.debug("📡 %s.%s -> %d bytes", server_name, tool_name, len(raw))
+                        if cacheable:
+                            self.cache.set(f"{server_name}.{tool_name}", parameters, result)
+                        return result
+                    else:
+                        error_text = await response.text()
+                        raise Exception(f"API call failed: {response.status} - {error_text}")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("❌ %s.%s error: %s", server_name, tool_name, e)
+            return self._get_fallback_data(tool_name, parameters)
+
+    async def call_servers(self, calls: List[Tuple[str, str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Issue several tool calls concurrently.
+
+        Wall time becomes the slowest single call instead of the sum; the
+        per-server semaphores inside call_server keep any one Node server
+        from being flooded.
+        """
+        return await asyncio.gather(*[
+            self.call_server(server_name, tool_name, parameters)
+            for server_name, tool_name, parameters in calls
+        ])
+
+    def _get_fallback_data(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Provide static sample data when a server is unreachable"""
+
+        builder = _FALLBACK_BUILDERS.get(tool_name)
+        if builder is not None:
+            return builder(parameters)
+        return {
+            'message': f"No live data available for {tool_name}",
+            'parameters': parameters,
+            'source': 'fallback_data'
+        }
+
+    def get_server_status(self) -> Dict[str, str]:
+        return {name: server.status for name, server in self.servers.items()}
+
+    async def shutdown(self):
+        self.monitor.stop_flusher()
+        if self._session:
+            await self._session.close()
+            self._session = None
+        logger.info("🔄 MCP manager shutdown complete")
@@ -0,0 +1,404 @@
+import asyncio
+import logging
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import spacy
+except ImportError:
+    spacy = None
+
+_WORD_RE = re.compile(r'\w+')
+_MONEY_DIGITS_RE = re.compile(r'\d+')
+
+# Single-word keywords live in frozensets probed against the tokenized
+# input -- O(1) hash lookups instead of a substring scan per keyword.
+# Multi-word phrases keep the substring check.
+_IMMEDIATE_WORDS = frozenset({'now', 'today', 'asap', 'urgent', 'tonight', 'immediately'})
+_IMMEDIATE_PHRASES = ('last minute',)
+_PLANNING_WORDS = frozenset({'planning', 'someday', 'eventually'})
+_PLANNING_PHRASES = ('next week', 'next month', 'thinking about')
+_COMPLEX_WORDS = frozenset({'stopover', 'stopovers'})
+_COMPLEX_PHRASES = ('multi-city', 'multi city', 'several cities', 'group trip', 'business and leisure')
+_LUXURY_WORDS = frozenset({'luxury', 'upscale', 'premium'})
+_LUXURY_PHRASES = ('five star', '5 star')
+_BUDGET_WORDS = frozenset({'cheap', 'budget', 'affordable', 'backpack', 'backpacking', 'hostel', 'hostels'})
+_INTEREST_WORDS = {
+    'food': frozenset({'food', 'foodie', 'restaurant', 'restaurants', 'eat', 'eating', 'cuisine'}),
+    'culture': frozenset({'museum', 'museums', 'history', 'culture', 'art'}),
+    'relaxation': frozenset({'beach', 'beaches', 'relax', 'relaxing', 'spa', 'resort', 'resorts'}),
+    'outdoors': frozenset({'hike', 'hiking', 'adventure', 'outdoor', 'outdoors', 'nature'}),
+    'nightlife': frozenset({'nightlife', 'bar', 'bars', 'club', 'clubs', 'party'}),
+}
+
+
+@dataclass
+class InputAnalysis:
+    """Result of analyzing one free-form travel request"""
+    intent: str
+    confidence: float
+    entities: Dict[str, Any] = field(default_factory=dict)
+    trip_flow: Optional[str] = None
+    urgency: str = 'flexible'
+    complexity: str = 'simple'
+    suggested_defaults: Dict[str, Any] = field(default_factory=dict)
+
+
+def _build_intent_patterns() -> Dict[str, Tuple[re.Pattern, int]]:
+    # Each intent's patterns are folded into one compiled alternation,
+    # so scoring is a single findall per intent instead of N separate
+    # search calls crossing the Python/C boundary
+    raw = {
+        'flight_search': [
+            r'\bflights?\b', r'\bfly(?:ing)?\b', r'\bplane\b', r'\bairlines?\b',
+            r'\bairports?\b', r'\bdepart(?:ure|ing)?\b', r'\bround.?trip\b',
+            r'\bone.?way\b', r'\bnonstop\b', r'\blayover\b',
+        ],
+        'hotel_search': [
+            r'\bhotels?\b', r'\bstay(?:ing)?\b', r'\baccommodations?\b',
+            r'\bresorts?\b', r'\bhostels?\b', r'\blodging\b', r'\bcheck.?in\b',
+            r'\bnights?\b', r'\bbook\s+a\s+room\b', r'\bairbnb\b',
+        ],
+        'places_search': [
+            r'\brestaurants?\b', r'\bactivit(?:y|ies)\b', r'\battractions?\b',
+            r'\bthings\s+to\s+do\b', r'\bmuseums?\b', r'\bsightseeing\b',
+            r'\btours?\b', r'\bnightlife\b', r'\beat(?:ing)?\b', r'\bvisit(?:ing)?\b',
+        ],
+        'combined_planning': [
+            r'\btrips?\b', r'\bvacations?\b', r'\bholidays?\b', r'\bgetaways?\b',
+            r'\bitinerar(?:y|ies)\b', r'\bplan(?:ning)?\b', r'\btravel(?:ing)?\b',
+            r'\bhoneymoon\b', r'\bweekend\s+away\b',
+        ],
+    }
+    return {intent: (re.compile('|'.join(f'(?:{p})' for p in patterns), re.IGNORECASE),
+                     len(patterns))
+            for intent, patterns in raw.items()}
+
+def _build_entity_patterns() -> Dict[str, re.Pattern]:
+    raw = {
+        'budget': r'\$\s?(\d[\d,]*)|(\d[\d,]*)\s?(?:dollars|usd|bucks)\b',
+        'travelers': r'\b(\d+)\s?(?:people|persons?|adults?|travel(?:l)?ers|guests?|of\s+us)\b',
+        'duration': r'\b(\d+)\s?(?:days?|nights?|weeks?)\b',
+        'dates': r'\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+\d{1,2}(?:st|nd|rd|th)?\b'
+                 r'|\b\d{4}-\d{2}-\d{2}\b|\b\d{1,2}/\d{1,2}(?:/\d{2,4})?\b',
+        # City names bounded to four words with no \s/[a-zA-Z] class
+        # overlap, so the match is effectively linear under re's
+        # backtracking engine even on adversarial input
+        'route': r'\bfrom\s+([a-zA-Z]+(?:\s[a-zA-Z]+){0,3}?)\s+to\s+([a-zA-Z]+(?:\s[a-zA-Z]+){0,3}?)(?=[,.!?]|$|\s+(?:on|in|for|with)\b)',
+    }
+    return {name: re.compile(p, re.IGNORECASE) for name, p in raw.items()}
+
+def _build_trip_type_patterns() -> Dict[str, re.Pattern]:
+    raw = {
+        'round_trip': r'\bround.?trip\b|\breturn(?:ing)?\b|\bcome\s+back\b|\band\s+back\b',
+        'one_way': r'\bone.?way\b|\bmoving\s+to\b|\brelocat(?:e|ing)\b|\bnot\s+coming\s+back\b',
+        'multi_city': r'\bmulti.?city\b|\bseveral\s+cities\b|\bcity.?hopping\b|\bthen\s+(?:on\s+)?to\b',
+    }
+    return {name: re.compile(p, re.IGNORECASE) for name, p in raw.items()}
+
+def _build_destination_patterns() -> Dict[str, str]:
+    # Lowercased substring -> canonical city name, mirroring the
+    # city table the frontend uses for airport lookup
+    return {
+        'new york': 'New York', 'nyc': 'New York', 'los angeles': 'Los Angeles',
+        'san francisco': 'San Francisco', 'chicago': 'Chicago', 'miami': 'Miami',
+        'las vegas': 'Las Vegas', 'seattle': 'Seattle', 'boston': 'Boston',
+        'denver': 'Denver', 'atlanta': 'Atlanta', 'dallas': 'Dallas',
+        'houston': 'Houston', 'orlando': 'Orlando', 'london': 'London',
+        'paris': 'Paris', 'tokyo': 'Tokyo', 'rome': 'Rome', 'barcelona': 'Barcelona',
+        'madrid': 'Madrid', 'amsterdam': 'Amsterdam', 'berlin': 'Berlin',
+        'dubai': 'Dubai', 'singapore': 'Singapore', 'hong kong': 'Hong Kong',
+        'sydney': 'Sydney', 'toronto': 'Toronto', 'vancouver': 'Vancouver',
+        'mexico city': 'Mexico City', 'cancun': 'Cancun', 'bangkok': 'Bangkok',
+        'istanbul': 'Istanbul', 'athens': 'Athens', 'lisbon': 'Lisbon',
+        'dublin': 'Dublin', 'prague': 'Prague', 'vienna': 'Vienna',
+        'honolulu': 'Honolulu', 'seoul': 'Seoul', 'mumbai': 'Mumbai',
+    }
+
+
+# Pattern assets are process-wide constants; building them at import time
+# means constructing an analyzer is just binding references, no matter how
+# many instances a worker creates
+_INTENT_PATTERNS = _build_intent_patterns()
+_ENTITY_PATTERNS = _build_entity_patterns()
+_TRIP_TYPE_PATTERNS = _build_trip_type_patterns()
+_DESTINATION_PATTERNS = _build_destination_patterns()
+_DESTINATION_REGEX = re.compile(
+    '|'.join(re.escape(k) for k in
+             sorted(_DESTINATION_PATTERNS, key=len, reverse=True)))
+_MASTER_PARTS = [f'(?P<{flow}>{pattern.pattern})'
+                 for flow, pattern in _TRIP_TYPE_PATTERNS.items()]
+_MASTER_PARTS += [f'(?P<{intent}>{pattern.pattern})'
+                  for intent, (pattern, _) in _INTENT_PATTERNS.items()]
+_MASTER_REGEX = re.compile('|'.join(_MASTER_PARTS), re.IGNORECASE)
+
+
+class SmartInputAnalyzer:
+    """Fast pattern-based analysis of natural-language travel requests.
+
+    Regex patterns are compiled once at construction so the per-request
+    path only runs compiled matchers; spaCy NER (if installed) fills in
+    entities the patterns miss.
+    """
+
+    def __init__(self):
+        self.intent_patterns = _INTENT_PATTERNS
+        self.entity_patterns = _ENTITY_PATTERNS
+        self.trip_type_patterns = _TRIP_TYPE_PATTERNS
+        self.destination_patterns = _DESTINATION_PATTERNS
+        self.destination_regex = _DESTINATION_REGEX
+        self._master_regex = _MASTER_REGEX
+        # Bounded LRU (same OrderedDict pattern as SmartCache) so a
+        # long-running server doesn't retain every unique input forever
+        self.analysis_cache: "OrderedDict[str, InputAnalysis]" = OrderedDict()
+        self.cache_max_size = int(os.getenv('ANALYZER_CACHE_SIZE', '4096'))
+
+        self.nlp = None
+        if spacy is not None:
+            try:
+                # Only NER is consumed; dropping the rest of the pipeline
+                # roughly halves per-doc latency
+                self.nlp = spacy.load(
+                    'en_core_web_sm',
+                    disable=['tagger', 'parser', 'attribute_ruler', 'lemmatizer'])
+                logger.info("✅ spaCy model loaded for NER")
+            except OSError:
+                logger.warning("⚠️  spaCy installed but en_core_web_sm missing; pattern-only analysis")
+
+    async def analyze_input(self, user_input: str) -> InputAnalysis:
+        # Lowercase exactly once; every helper that needs it gets this
+        # string instead of re-allocating its own copy
+        input_lower = user_input.lower()
+        # Tokenize once; the cache key, urgency, complexity, and defaults
+        # helpers all share this word set instead of re-scanning the input
+        tokens = _WORD_RE.findall(input_lower)
+        cache_key = self._cache_key(input_lower, tokens)
+        cached = self.analysis_cache.get(cache_key)
+        if cached is not None:
+            self.analysis_cache.move_to_end(cache_key)
+            return cached
+        word_set = frozenset(tokens)
+        entities = self._extract_entities_fast(user_input, input_lower)
+
+        # spaCy only contributes destination/budget/dates; skip the most
+        # expensive step entirely when the regex layer already found them
+        if self.nlp and self._needs_nlp(entities):
+            await self._extract_entities_nlp(user_input, entities)
+
+        analysis = self._finish_analysis(user_input, input_lower, word_set, entities)
+        self._cache_store(cache_key, analysis)
+        return analysis
+
+    async def analyze_inputs(self, texts: List[str]) -> List[InputAnalysis]:
+        """Batch analysis: pattern passes run per text, spaCy NER runs
+        once over the whole batch via nlp.pipe"""
+        results: List[Optional[InputAnalysis]] = [None] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            input_lower = text.lower()
+            tokens = _WORD_RE.findall(input_lower)
+            cache_key = self._cache_key(input_lower, tokens)
+            cached = self.analysis_cache.get(cache_key)
+            if cached is not None:
+                self.analysis_cache.move_to_end(cache_key)
+                results[i] = cached
+                continue
+            pending.append((i, text, input_lower, cache_key, frozenset(tokens),
+                            self._extract_entities_fast(text, input_lower)))
+
+        if self.nlp and pending:
+            batch = [text for _, text, _, _, _, entities in pending
+                     if self._needs_nlp(entities)]
+            if batch:
+                docs = await asyncio.to_thread(
+                    lambda: list(self.nlp.pipe(batch, batch_size=64)))
+                doc_iter = iter(docs)
+                for _, _, _, _, _, entities in pending:
+                    if self._needs_nlp(entities):
+                        self._merge_nlp_entities(next(doc_iter), entities)
+
+        for i, text, input_lower, cache_key, word_set, entities in pending:
+            analysis = self._finish_analysis(text, input_lower, word_set, entities)
+            self._cache_store(cache_key, analysis)
+            results[i] = analysis
+        return results
+
+    @staticmethod
+    def _cache_key(input_lower: str, tokens: List[str]) -> str:
+        """Canonical fingerprint so trivial paraphrases share a cache entry"""
+        # Sorted tokens erase meaning wherever order matters: from/to
+        # routes ("from X to Y" vs "from Y to X") and any input with
+        # numbers, whose placement binds them ("5 people for 3 nights" vs
+        # "3 people for 5 nights"). Keep the exact string for those; only
+        # purely textual inputs get the order-insensitive fingerprint.
+        if 'from' in tokens and 'to' in tokens:
+            return input_lower.strip()
+        if any(c.isdigit() for c in input_lower):
+            return input_lower.strip()
+        return ' '.join(sorted(set(tokens)))
+
+    def _finish_analysis(self, user_input: str, input_lower: str,
+                         word_set: frozenset, entities: Dict[str, Any]) -> InputAnalysis:
+        buckets = self._scan_buckets(user_input)
+        intent, confidence = self._classify_intent_fast(input_lower, buckets)
+        return InputAnalysis(
+            intent=intent,
+            confidence=confidence,
+            entities=entities,
+            trip_flow=self._detect_trip_flow(buckets),
+            urgency=self._determine_urgency(input_lower, word_set, entities),
+            complexity=self._determine_complexity(input_lower, word_set, entities),
+            suggested_defaults=self.get_smart_defaults(input_lower, word_set, entities),
+        )
+
+    def _cache_store(self, cache_key: str, analysis: InputAnalysis):
+        if len(self.analysis_cache) >= self.cache_max_size:
+            self.analysis_cache.popitem(last=False)
+        self.analysis_cache[cache_key] = analysis
+
+    def _scan_buckets(self, user_input: str) -> Dict[str, int]:
+        """Single pass over the input counting hits per named bucket"""
+        counts: Dict[str, int] = {}
+        for match in self._master_regex.finditer(user_input):
+            group = match.lastgroup
+            counts[group] = counts.get(group, 0) + 1
+        return counts
+
+    def _classify_intent_fast(self, input_lower: str, buckets: Dict[str, int]) -> Tuple[str, float]:
+        scores: Dict[str, float] = {}
+        for intent, (_, pattern_count) in self.intent_patterns.items():
+            scores[intent] = buckets.get(intent, 0) / pattern_count
+        # Flow phrases swallowed by the trip-flow buckets are still flight
+        # vocabulary; credit them back so scoring matches separate scans
+        flow_hits = buckets.get('round_trip', 0) + buckets.get('one_way', 0)
+        if flow_hits:
+            _, pattern_count = self.intent_patterns['flight_search']
+            scores['flight_search'] += flow_hits / pattern_count
+
+        # A recognized destination is a strong signal the user wants a
+        # full plan rather than a single vertical
+        if self.destination_regex.search(input_lower):
+            scores['combined_planning'] = scores.get('combined_planning', 0.0) + 0.1
+
+        intent = max(scores, key=scores.get)
+        confidence = min(scores[intent] * 2, 1.0)
+        if confidence == 0.0:
+            return 'combined_planning', 0.2
+        return intent, confidence
+
+    def _extract_entities_fast(self, user_input: str, input_lower: str) -> Dict[str, Any]:
+        entities: Dict[str, Any] = {}
+
+        match = self.entity_patterns['budget'].search(user_input)
+        if match:
+            amount = match.group(1) or match.group(2)
+            entities['budget'] = int(amount.replace(',', ''))
+
+        match = self.entity_patterns['travelers'].search(user_input)
+        if match:
+            entities['travelers'] = int(match.group(1))
+
+        match = self.entity_patterns['duration'].search(user_input)
+        if match:
+            entities['duration'] = match.group(0)
+
+        match = self.entity_patterns['dates'].search(user_input)
+        if match:
+            entities['dates'] = match.group(0)
+
+        match = self.entity_patterns['route'].search(user_input)
+        if match:
+            entities['origin'] = match.group(1).strip().title()
+            entities['destination'] = match.group(2).strip().title()
+
+        if 'destination' not in entities:
+            match = self.destination_regex.search(input_lower)
+            if match:
+                entities['destination'] = self.destination_patterns[match.group(0)]
+
+        return entities
+
+    def classify_intents_batch(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """Intent-only classification for many inputs, skipping the
+        entity/NLP stages entirely"""
+        return [self._classify_intent_fast(text.lower(), self._scan_buckets(text))
+                for text in texts]
+
+    @staticmethod
+    def _needs_nlp(entities: Dict[str, Any]) -> bool:
+        return not ({'destination', 'budget', 'dates'} <= entities.keys())
+
+    async def _extract_entities_nlp(self, user_input: str, entities: Dict[str, Any]):
+        """Fill in entities the regex layer missed using spaCy NER"""
+        # spaCy is CPU-bound for tens of ms; run it off the event loop the
+        # same way main.py offloads Gemini calls
+        doc = await asyncio.to_thread(self.nlp, user_input)
+        self._merge_nlp_entities(doc, entities)
+
+    def _merge_nlp_entities(self, doc, entities: Dict[str, Any]):
+        for ent in doc.ents:
+            if ent.label_ == 'GPE' and 'destination' not in entities:
+                entities['destination'] = ent.text
+            elif ent.label_ == 'MONEY' and 'budget' not in entities:
+                match = _MONEY_DIGITS_RE.search(ent.text)
+                if match:
+                    entities['budget'] = int(match.group(0))
+            elif ent.label_ == 'DATE' and 'dates' not in entities:
+                entities['dates'] = ent.text
+
+    def _detect_trip_flow(self, buckets: Dict[str, int]) -> Optional[str]:
+        for flow in self.trip_type_patterns:
+            if buckets.get(flow):
+                return flow
+        return None
+
+    def _determine_urgency(self, input_lower: str, word_set: frozenset,
+                           entities: Dict[str, Any]) -> str:
+        if not _IMMEDIATE_WORDS.isdisjoint(word_set) or \
+                any(p in input_lower for p in _IMMEDIATE_PHRASES):
+            return 'immediate'
+        if not _PLANNING_WORDS.isdisjoint(word_set) or \
+                any(p in input_lower for p in _PLANNING_PHRASES):
+            return 'planning'
+        if 'dates' in entities:
+            return 'scheduled'
+        return 'flexible'
+
+    def _determine_complexity(self, input_lower: str, word_set: frozenset,
+                              entities: Dict[str, Any]) -> str:
+        word_count = len(input_lower.split())
+        if not _COMPLEX_WORDS.isdisjoint(word_set) or \
+                any(p in input_lower for p in _COMPLEX_PHRASES):
+            return 'complex'
+        if word_count > 25 or len(entities) >= 4:
+            return 'complex'
+        if word_count > 12 or len(entities) >= 2:
+            return 'moderate'
+        return 'simple'
+
+    def get_smart_defaults(self, input_lower: str, word_set: frozenset,
+                           entities: Dict[str, Any]) -> Dict[str, Any]:
+        defaults: Dict[str, Any] = {
+            'travelers': entities.get('travelers', 1),
+            'currency': 'USD',
+        }
+
+        if not _LUXURY_WORDS.isdisjoint(word_set) or \
+                any(p in input_lower for p in _LUXURY_PHRASES):
+            defaults['budget_level'] = 'luxury'
+        elif not _BUDGET_WORDS.isdisjoint(word_set):
+            defaults['budget_level'] = 'budget'
+        else:
+            defaults['budget_level'] = 'mid-range'
+
+        interests = [interest for interest, keywords in _INTEREST_WORDS.items()
+                     if not keywords.isdisjoint(word_set)]
+        if interests:
+            defaults['interests'] = interests
+
+        return defaults